@@ -6,20 +6,32 @@ A focused scraper for the new.kenyalaw.org/judgements website with
 specific optimizations for that site's structure and pagination system.
 """
 
+import io
 import os
 import re
 import time
 import json
+import hashlib
 import random
+import signal
+import atexit
 import logging
+import threading
 import argparse
 import requests
-from bs4 import BeautifulSoup
+import zstandard
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import EncodingDetector
+import soupsieve
+from lxml import etree
 from urllib.parse import urljoin, urlparse, parse_qs
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 import csv
+import sqlite3
 
 # Configure logging
 logging.basicConfig(
@@ -38,6 +50,7 @@ SEARCH_URL = 'https://new.kenyalaw.org/judgments/search'
 JUDGMENT_DIR = 'KLR'
 METADATA_FILE = os.path.join(JUDGMENT_DIR, 'metadata.csv')
 PROGRESS_FILE = os.path.join(JUDGMENT_DIR, 'progress.json')
+PROGRESS_DB = os.path.join(JUDGMENT_DIR, 'progress.db')
 ERROR_LOG = os.path.join(JUDGMENT_DIR, 'errors.log')
 
 # User agent rotation to avoid detection
@@ -57,7 +70,48 @@ BACKOFF_FACTOR = 2  # Exponential backoff factor for retries
 
 # Scraping parameters
 RESULTS_PER_PAGE = 20  # Number of results per page
+DEFAULT_TOTAL_JUDGMENTS = 275979  # Known total, used only if the site's count can't be read
 MAX_WORKERS = 3  # Number of parallel workers (keep low to avoid server strain)
+METADATA_FLUSH_EVERY = 64  # Write buffered metadata.csv rows after this many rows
+METADATA_FLUSH_INTERVAL = 30  # ...or after this many seconds, whichever comes first
+ZSTD_LEVEL = 10  # Compression level for saved judgment HTML
+
+# Parse only the parts of each page we actually use (lxml + SoupStrainer).
+# Class regexes match whole tokens, since the strainer tests them against the
+# full class attribute (e.g. "card mb-3").
+LISTING_STRAINER = SoupStrainer(
+    class_=re.compile(r'(?:^|\s)(?:card|case-result|search-result-item|result-item)(?:\s|$)')
+)
+ARTICLE_STRAINER = SoupStrainer('article')
+TOTAL_PAGES_STRAINER = SoupStrainer(class_=re.compile(r'(?:^|\s)(?:search-result-count|pagination)(?:\s|$)'))
+METADATA_STRAINER = SoupStrainer(class_=re.compile(r'(?:^|\s)(?:case-metadata|judgment-metadata)(?:\s|$)'))
+
+# CSS selectors in order of preference. Each list is also compiled into one union
+# selector so the tree is walked once, then matches are ranked by preference.
+LISTING_CARD_SELECTORS = ['.card', '.case-result', '.search-result-item', '.result-item']
+LISTING_CARD_PATTERNS = [soupsieve.compile(selector) for selector in LISTING_CARD_SELECTORS]
+LISTING_CARD_UNION = soupsieve.compile(', '.join(LISTING_CARD_SELECTORS))
+CONTENT_SELECTORS = ['#judgment-content', '.judgment-content', '.case-content', 'article', '.main-content', '.content-area']
+CONTENT_PATTERNS = [soupsieve.compile(selector) for selector in CONTENT_SELECTORS]
+CONTENT_UNION = soupsieve.compile(', '.join(CONTENT_SELECTORS))
+
+# Precompiled patterns
+FILENAME_SANITIZE_RE = re.compile(r'[\\/*?:"<>|]')
+NON_DIGIT_RE = re.compile(r'[^\d]')
+PAGE_PARAM_RE = re.compile(r'page=(\d+)')
+
+# Court name keywords and their directories, checked in order of precedence
+COURT_KEYWORDS = [
+    ('supreme court', 'supreme_court'),
+    ('court of appeal', 'court_of_appeal'),
+    ('high court', 'high_court'),
+    ('employment', 'employment_and_labour_court'),
+    ('labour', 'employment_and_labour_court'),
+    ('environment', 'environment_and_land_court'),
+    ('land', 'environment_and_land_court'),
+    ('magistrate', 'magistrates_courts'),
+    ('tribunal', 'specialized_tribunals'),
+]
 
 
 class KenyaLawReportsScraper:
@@ -69,8 +123,7 @@ class KenyaLawReportsScraper:
         self.start_page = start_page
         
         # Create output directory if it doesn't exist
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
             
         # Create directories for different court hierarchies
         self.courts = [
@@ -86,12 +139,50 @@ class KenyaLawReportsScraper:
         
         for court in self.courts:
             court_dir = os.path.join(output_dir, court)
-            if not os.path.exists(court_dir):
-                os.makedirs(court_dir)
+            os.makedirs(court_dir, exist_ok=True)
+            
+        # zstd compressors are not thread-safe, so each worker thread gets its own
+        self._zstd = threading.local()
+        
+        # Long-lived worker pool shared by every page of every run
+        self._pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='klr')
+        
+        # Site-wide rate limiting shared by all worker threads
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+        
+        # Map court keywords to their directories once
+        self._court_dirs = [(keyword, os.path.join(output_dir, court)) for keyword, court in COURT_KEYWORDS]
+        self._other_court_dir = os.path.join(output_dir, 'other_courts')
             
         # Initialize session with cookies and headers
         self.session = requests.Session()
         
+        # Pool connections so repeated requests reuse the same TCP/TLS connection,
+        # and let urllib3 handle retries with exponential backoff
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=BACKOFF_FACTOR,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(
+            pool_connections=MAX_WORKERS * 2,
+            pool_maxsize=MAX_WORKERS * 4,
+            max_retries=retry
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            # Only advertise encodings urllib3 can actually decode here (br needs brotli)
+            'Accept-Encoding': requests.utils.DEFAULT_ACCEPT_ENCODING,
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+            'Cache-Control': 'max-age=0',
+        })
+        
         # Load progress if resuming
         self.progress = self._load_progress() if resume else {
             'scraped_judgments': set(),
@@ -99,42 +190,130 @@ class KenyaLawReportsScraper:
             'errors': []
         }
         
-        # Initialize metadata CSV file if it doesn't exist
-        if not os.path.exists(METADATA_FILE):
-            with open(METADATA_FILE, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    'id', 'case_number', 'title', 'court', 'date', 
-                    'judges', 'parties', 'filename', 'url', 'scraped_at'
-                ])
+        # Scraped judgment IDs are recorded in SQLite, one row per judgment, so
+        # progress.json only holds the small page/error state
+        self._progress_lock = threading.Lock()
+        self.db = sqlite3.connect(PROGRESS_DB, isolation_level=None, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS scraped(id TEXT PRIMARY KEY)')
+        if resume:
+            # Migrate IDs from progress files written by older versions
+            if self.db.execute('SELECT 1 FROM scraped LIMIT 1').fetchone() is None:
+                # No recorded progress, so recover judgments already saved on disk. When the
+                # database exists it is authoritative: a saved file whose ID is missing may
+                # have lost its metadata row in a crash and is fetched again.
+                self.progress['scraped_judgments'].update(self._scan_saved_judgments())
+            self.db.execute('BEGIN')
+            self.db.executemany('INSERT OR IGNORE INTO scraped VALUES(?)',
+                                ((judgment_id,) for judgment_id in self.progress['scraped_judgments']))
+            self.db.execute('COMMIT')
+            self.progress['scraped_judgments'] = {row[0] for row in self.db.execute('SELECT id FROM scraped')}
+        else:
+            self.db.execute('DELETE FROM scraped')
+        atexit.register(self.db.close)
+        atexit.register(self._save_progress)
+        signal.signal(signal.SIGINT, self._handle_interrupt)
+        signal.signal(signal.SIGTERM, self._handle_interrupt)
+        
+        # Keep the metadata CSV open for the whole run; rows are buffered and written in batches
+        self._meta_fp = open(METADATA_FILE, 'a', newline='', encoding='utf-8', buffering=1 << 16)
+        self._meta_writer = csv.writer(self._meta_fp)
+        
+        # Write the header if the file is new (append mode starts at the end of the file)
+        if self._meta_fp.tell() == 0:
+            self._meta_writer.writerow([
+                'id', 'case_number', 'title', 'court', 'date', 
+                'judges', 'parties', 'filename', 'url', 'scraped_at'
+            ])
+            self._meta_fp.flush()
+        self._meta_lock = threading.Lock()
+        self._meta_buf = []
+        self._meta_last_flush = time.monotonic()
+        atexit.register(self._close_metadata)
         
         # Initialize error log if it doesn't exist
-        if not os.path.exists(ERROR_LOG):
-            with open(ERROR_LOG, 'w', encoding='utf-8') as f:
+        with open(ERROR_LOG, 'a', encoding='utf-8') as f:
+            if f.tell() == 0:
                 f.write("# Kenya Law Reports Scraper Error Log\n\n")
     
+    def _flush_metadata(self):
+        """Write buffered metadata rows to the CSV file. Call with _meta_lock held.
+        
+        The judgment IDs are only recorded in PROGRESS_DB once their rows are on
+        disk, so a crash can never leave a judgment marked scraped without metadata.
+        """
+        rows = self._meta_buf
+        self._meta_buf = []
+        if rows:
+            self._meta_writer.writerows(rows)
+        self._meta_fp.flush()
+        os.fsync(self._meta_fp.fileno())
+        self._meta_last_flush = time.monotonic()
+        
+        if rows:
+            with self._progress_lock:
+                self.db.execute('BEGIN')
+                self.db.executemany('INSERT OR IGNORE INTO scraped VALUES(?)', ((row[0],) for row in rows))
+                self.db.execute('COMMIT')
+    
+    def _close_metadata(self):
+        """Write any remaining metadata rows and close the CSV file."""
+        with self._meta_lock:
+            self._flush_metadata()
+            self._meta_fp.close()
+    
     def _load_progress(self):
         """Load progress from file if it exists."""
         if os.path.exists(PROGRESS_FILE):
             try:
                 with open(PROGRESS_FILE, 'r') as f:
                     progress = json.load(f)
-                    # Convert scraped_judgments list to set for faster lookups
-                    progress['scraped_judgments'] = set(progress['scraped_judgments'])
+                    # Older progress files also stored the scraped judgment IDs
+                    progress['scraped_judgments'] = set(progress.get('scraped_judgments', []))
                     return progress
             except (json.JSONDecodeError, KeyError) as e:
                 logger.warning(f"Progress file corrupted: {str(e)}. Starting from scratch.")
                 return {'scraped_judgments': set(), 'last_page': 0, 'errors': []}
         return {'scraped_judgments': set(), 'last_page': 0, 'errors': []}
     
-    def _save_progress(self):
-        """Save current progress to file."""
-        # Convert set to list for JSON serialization
-        progress_copy = self.progress.copy()
-        progress_copy['scraped_judgments'] = list(self.progress['scraped_judgments'])
+    def _scan_saved_judgments(self):
+        """Yield the IDs of judgments already saved in the court directories."""
+        def scan(path):
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # Bucket subdirectory
+                        yield from scan(entry.path)
+                    elif entry.name.endswith(('.html.zst', '.html')):
+                        # Filenames are "<case_number>_<id>.html.zst" or "<id>.html.zst"
+                        # (".html" for judgments saved by older versions)
+                        name = entry.name[:-len('.zst')] if entry.name.endswith('.zst') else entry.name
+                        yield name[:-len('.html')].rsplit('_', 1)[-1]
         
-        with open(PROGRESS_FILE, 'w') as f:
-            json.dump(progress_copy, f)
+        for court in self.courts:
+            yield from scan(os.path.join(self.output_dir, court))
+    
+    def _save_progress(self):
+        """Save current progress to file, atomically replacing the previous one."""
+        with self._progress_lock:
+            # Scraped judgment IDs live in PROGRESS_DB, not in the JSON file
+            progress_copy = {k: v for k, v in self.progress.items() if k != 'scraped_judgments'}
+            progress_copy['errors'] = list(self.progress['errors'])
+            
+            tmp_file = PROGRESS_FILE + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(progress_copy, f)
+            os.replace(tmp_file, PROGRESS_FILE)
+    
+    def _handle_interrupt(self, signum, frame):
+        """Stop the scraper on CTRL+C (or SIGTERM from run.sh's timeout) via KeyboardInterrupt.
+        
+        Progress and buffered metadata rows are saved by the atexit handlers rather
+        than here, since the interrupted code may already hold their locks.
+        """
+        logger.warning("Interrupted. Saving progress before exiting.")
+        signal.default_int_handler(signum, frame)
     
     def _get_random_user_agent(self):
         """Return a random user agent from the list."""
@@ -157,82 +336,118 @@ class KenyaLawReportsScraper:
             'url': url
         })
     
-    def _make_request(self, url, method='get', data=None, params=None):
-        """Make a request with exponential backoff retry logic."""
-        headers = {
-            'User-Agent': self._get_random_user_agent(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Cache-Control': 'max-age=0',
-        }
+    def _extract_judgment_content(self, response):
+        """Stream-parse a judgment page and return its judgment content element as bytes.
+        
+        Follows the same preference as the BeautifulSoup path: the #judgment-content
+        element first, then the first .judgment-content element, each taken whole
+        (nested matches are part of it, not candidates of their own). Elements outside
+        these are cleared as soon as they are parsed, so memory use follows the size
+        of the judgment rather than the whole page. Returns None if the preferred
+        element is missing or too short, leaving the choice to the BeautifulSoup path.
+        """
+        html = response.content
+        # Charset from the Content-Type header, then <meta>, defaulting to UTF-8
+        if 'charset' in response.headers.get('Content-Type', '').lower():
+            encoding = response.encoding
+        else:
+            encoding = EncodingDetector.find_declared_encoding(html, is_html=True) or 'utf-8'
         
-        retries = 0
+        id_elem = class_elem = None
+        class_content = None  # Serialized first .judgment-content, used if no #judgment-content
+        inside = 0  # Nesting depth inside a candidate element
+        try:
+            for event, elem in etree.iterparse(io.BytesIO(html), events=('start', 'end'),
+                                               html=True, encoding=encoding):
+                if event == 'start':
+                    if id_elem is None and elem.get('id') == 'judgment-content':
+                        id_elem = elem
+                        inside += 1
+                    elif class_elem is None and 'judgment-content' in (elem.get('class') or '').split():
+                        class_elem = elem
+                        inside += 1
+                elif elem is id_elem:
+                    # #judgment-content takes precedence over any .judgment-content
+                    if len(''.join(elem.itertext()).strip()) > 100:  # Ensure meaningful content
+                        return etree.tostring(elem, encoding='utf-8', method='html', with_tail=False)
+                    return None
+                elif elem is class_elem:
+                    inside -= 1
+                    if len(''.join(elem.itertext()).strip()) <= 100:
+                        return None
+                    # Keep scanning in case #judgment-content appears later in the page
+                    class_content = etree.tostring(elem, encoding='utf-8', method='html', with_tail=False)
+                    if not inside:
+                        elem.clear()
+                elif not inside:
+                    elem.clear()
+        except (etree.LxmlError, LookupError, ValueError) as e:
+            logger.debug(f"Streaming parse failed, falling back to BeautifulSoup: {str(e)}")
+            return None
+        return class_content
+    
+    def _compress(self, data):
+        """Compress data with this thread's zstd compressor."""
+        compressor = getattr(self._zstd, 'compressor', None)
+        if compressor is None:
+            compressor = self._zstd.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        return compressor.compress(data)
+    
+    def _acquire_rate(self):
+        """Block until the next request may be sent, spacing requests site-wide by a random delay."""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next_request_at - now)
+            self._next_request_at = now + wait + random.uniform(MIN_DELAY, MAX_DELAY)
+        if wait:
+            time.sleep(wait)
+    
+    def _make_request(self, url, method='get', data=None, params=None):
+        """Make a request through the pooled session, which retries with exponential backoff."""
+        # Static headers are set on the session; only the user agent varies per request
+        headers = {'User-Agent': self._get_random_user_agent()}
         
-        while retries <= MAX_RETRIES:
-            try:
-                if method.lower() == 'get':
-                    response = self.session.get(url, headers=headers, params=params, timeout=30)
-                else:  # POST
-                    response = self.session.post(url, headers=headers, data=data, timeout=30)
-                
-                # Check if we're being rate limited or got an error
-                if response.status_code == 429:
-                    wait_time = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f"Rate limited. Waiting for {wait_time} seconds.")
-                    time.sleep(wait_time)
-                    retries += 1
-                    continue
-                
-                if response.status_code >= 400:
-                    logger.warning(f"HTTP error {response.status_code} for {url}. Retrying...")
-                    time.sleep(MIN_DELAY * (BACKOFF_FACTOR ** retries))
-                    retries += 1
-                    continue
-                
-                return response
-                
-            except (requests.exceptions.RequestException, requests.exceptions.Timeout) as e:
-                logger.warning(f"Request error for {url}: {str(e)}. Retrying...")
-                time.sleep(MIN_DELAY * (BACKOFF_FACTOR ** retries))
-                retries += 1
+        self._acquire_rate()
         
-        logger.error(f"Failed to fetch {url} after {MAX_RETRIES} retries.")
-        self._log_error(f"Failed to fetch after {MAX_RETRIES} retries", url)
-        return None
+        try:
+            # Retries and backoff (including Retry-After on 429) are handled by the mounted adapter
+            response = self.session.request(
+                method.upper(), url, headers=headers, params=params, data=data, timeout=30
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to fetch {url} after {MAX_RETRIES} retries: {str(e)}")
+            self._log_error(f"Failed to fetch after {MAX_RETRIES} retries: {str(e)}", url)
+            return None
+        
+        if response.status_code >= 400:
+            logger.error(f"HTTP error {response.status_code} for {url}")
+            self._log_error(f"HTTP error {response.status_code}", url)
+            return None
+        
+        return response
     
     def _determine_court_directory(self, court_name):
         """Determine the appropriate directory for a judgment based on court name."""
         court_name = court_name.lower() if court_name else ""
         
-        if "supreme court" in court_name:
-            return os.path.join(self.output_dir, "supreme_court")
-        elif "court of appeal" in court_name:
-            return os.path.join(self.output_dir, "court_of_appeal")
-        elif "high court" in court_name:
-            return os.path.join(self.output_dir, "high_court")
-        elif "employment" in court_name or "labour" in court_name:
-            return os.path.join(self.output_dir, "employment_and_labour_court")
-        elif "environment" in court_name or "land" in court_name:
-            return os.path.join(self.output_dir, "environment_and_land_court")
-        elif "magistrate" in court_name:
-            return os.path.join(self.output_dir, "magistrates_courts")
-        elif "tribunal" in court_name:
-            return os.path.join(self.output_dir, "specialized_tribunals")
-        else:
-            return os.path.join(self.output_dir, "other_courts")
+        for keyword, court_dir in self._court_dirs:
+            if keyword in court_name:
+                return court_dir
+        return self._other_court_dir
     
     def get_total_pages(self):
-        """Get the total number of pages of results."""
+        """Get the total number of pages of results.
+        
+        Returns 0 if the search page could not be fetched and None if it was
+        fetched but contained no result count or pagination to read it from.
+        """
         # Start with a search to get the total results
         response = self._make_request(SEARCH_URL)
         if not response:
-            logger.error("Failed to get total pages. Exiting.")
+            logger.error("Failed to get total pages.")
             return 0
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=TOTAL_PAGES_STRAINER)
         
         # Look for pagination information
         try:
@@ -241,7 +456,7 @@ class KenyaLawReportsScraper:
             if result_text:
                 text = result_text.text.strip()
                 # Extract total from text like "275,979 Results"
-                total_results = int(re.sub(r'[^\d]', '', text))
+                total_results = int(NON_DIGIT_RE.sub('', text))
                 return (total_results + RESULTS_PER_PAGE - 1) // RESULTS_PER_PAGE
             
             # Alternative: check last page button
@@ -250,7 +465,7 @@ class KenyaLawReportsScraper:
                 last_page = 0
                 for link in pagination:
                     if link.get('href'):
-                        page_match = re.search(r'page=(\d+)', link.get('href'))
+                        page_match = PAGE_PARAM_RE.search(link.get('href'))
                         if page_match:
                             page = int(page_match.group(1))
                             last_page = max(last_page, page)
@@ -262,9 +477,7 @@ class KenyaLawReportsScraper:
             logger.error(f"Error parsing total pages: {str(e)}")
             self._log_error(f"Error parsing total pages: {str(e)}")
         
-        # Default fallback - use the known total divided by results per page
-        logger.warning("Using default total judgments count (275,979)")
-        return (275979 + RESULTS_PER_PAGE - 1) // RESULTS_PER_PAGE
+        return None
     
     def get_judgments_on_page(self, page):
         """Get all judgment links from a specific page."""
@@ -278,15 +491,21 @@ class KenyaLawReportsScraper:
             logger.error(f"Failed to fetch page {page}")
             return []
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=LISTING_STRAINER)
         judgments = []
+        seen = set()  # Judgment IDs already taken from this page
         
         # Find all judgment cards or containers
-        judgment_cards = soup.select('.card') or soup.select('.case-result') or soup.select('.search-result-item')
+        candidates = LISTING_CARD_UNION.select(soup)
+        cards, case_results, search_items, result_items = (
+            [elem for elem in candidates if pattern.match(elem)] for pattern in LISTING_CARD_PATTERNS
+        )
+        judgment_cards = cards or case_results or search_items
         
         if not judgment_cards:
             # If specific selectors don't work, try more generic ones
-            judgment_cards = soup.select('article') or soup.select('.result-item')
+            article_soup = BeautifulSoup(response.content, 'lxml', parse_only=ARTICLE_STRAINER)
+            judgment_cards = article_soup.select('article') or result_items
         
         for card in judgment_cards:
             try:
@@ -305,8 +524,9 @@ class KenyaLawReportsScraper:
                 
                 # Extract judgment ID from URL
                 judgment_id = os.path.basename(urlparse(link).path).split('.')[0]
-                if not judgment_id or judgment_id in self.progress['scraped_judgments']:
+                if not judgment_id or judgment_id in seen or judgment_id in self.progress['scraped_judgments']:
                     continue
+                seen.add(judgment_id)
                 
                 # Extract title
                 title = link_elem.text.strip()
@@ -358,9 +578,6 @@ class KenyaLawReportsScraper:
             logger.debug(f"Skipping already scraped judgment: {judgment_id}")
             return judgment_data
         
-        # Random delay to avoid overloading the server
-        time.sleep(random.uniform(MIN_DELAY, MAX_DELAY))
-        
         # Fetch the judgment page
         response = self._make_request(link)
         if not response:
@@ -369,20 +586,32 @@ class KenyaLawReportsScraper:
             self._log_error(f"Failed to fetch judgment {judgment_id}", link)
             return judgment_data
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # Common case: stream the page and pull out #judgment-content directly
+        content = self._extract_judgment_content(response)
+        
+        # Metadata is only read from the page if the listing card was missing some of it
+        need_meta = not all(judgment_data.get(k) for k in ('case_number', 'court', 'date', 'judges'))
+        
+        soup = None
+        if content is None:
+            # No judgment-content element, so search the whole page with the fallback selectors
+            soup = BeautifulSoup(response.content, 'lxml')
         
         try:
             # Enhanced metadata extraction from the judgment page
             judgment_metadata = judgment_data.copy()
             
             # Extract more precise metadata if available
-            meta_elems = soup.select('.case-metadata .metadata-item') or soup.select('.judgment-metadata span')
-            for elem in meta_elems:
-                text = elem.text.strip()
-                if ':' in text:
-                    key, value = text.split(':', 1)
-                    key = key.strip().lower().replace(' ', '_')
-                    judgment_metadata[key] = value.strip()
+            if need_meta:
+                # Without a full parse already at hand, build only the metadata blocks
+                meta_soup = soup or BeautifulSoup(response.content, 'lxml', parse_only=METADATA_STRAINER)
+                meta_elems = meta_soup.select('.case-metadata .metadata-item') or meta_soup.select('.judgment-metadata span')
+                for elem in meta_elems:
+                    text = elem.text.strip()
+                    if ':' in text:
+                        key, value = text.split(':', 1)
+                        key = key.strip().lower().replace(' ', '_')
+                        judgment_metadata[key] = value.strip()
             
             # Create sanitized case number for filename
             court_dir = self._determine_court_directory(judgment_metadata.get('court', ''))
@@ -390,38 +619,45 @@ class KenyaLawReportsScraper:
             # Create appropriate filename
             if judgment_metadata.get('case_number'):
                 # Sanitize case number for filename
-                case_number = re.sub(r'[\\/*?:"<>|]', '_', judgment_metadata['case_number'])
+                case_number = FILENAME_SANITIZE_RE.sub('_', judgment_metadata['case_number'])
                 case_number = case_number.replace(' ', '_').replace('/', '_').strip('_')
-                filename = f"{case_number}_{judgment_id}.html"
+                filename = f"{case_number}_{judgment_id}.html.zst"
             else:
-                filename = f"{judgment_id}.html"
+                filename = f"{judgment_id}.html.zst"
             
-            # Extract judgment content
-            content = None
-            
-            # Try different possible content selectors
-            for selector in ['#judgment-content', '.judgment-content', '.case-content', 'article', '.main-content', '.content-area']:
-                content_elem = soup.select_one(selector)
-                if content_elem and len(content_elem.text.strip()) > 100:  # Ensure meaningful content
-                    content = content_elem
-                    break
+            # Extract judgment content if the fast path did not find it
+            if content is None:
+                # Try different possible content selectors, using the first match of each in order
+                candidates = CONTENT_UNION.select(soup)
+                for pattern in CONTENT_PATTERNS:
+                    content_elem = next((elem for elem in candidates if pattern.match(elem)), None)
+                    if content_elem and len(content_elem.text.strip()) > 100:  # Ensure meaningful content
+                        content = content_elem.encode('utf-8')
+                        break
             
             if not content:
                 # If still no content, try getting the main text area
                 main_content = soup.find('main') or soup.find('article') or soup.select_one('.content')
                 if main_content:
-                    content = main_content
+                    content = main_content.encode('utf-8')
             
             if content:
-                # Save the judgment HTML
+                # Save the judgment HTML, zstd-compressed
+                # Shard each court directory into 256 buckets keyed on the judgment ID
+                bucket = hashlib.md5(judgment_id.encode('utf-8')).hexdigest()[:2]
+                os.makedirs(os.path.join(court_dir, bucket), exist_ok=True)
+                filename = os.path.join(bucket, filename)
                 file_path = os.path.join(court_dir, filename)
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(str(content))
+                # Write to a temp file and rename, so a crash never leaves a truncated
+                # judgment that the resume scan would take as complete
+                tmp_path = file_path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(self._compress(content))
+                os.replace(tmp_path, file_path)
                 
                 # Save metadata to CSV
-                with open(METADATA_FILE, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow([
+                with self._meta_lock:
+                    self._meta_buf.append([
                         judgment_id,
                         judgment_metadata.get('case_number', ''),
                         judgment_metadata.get('title', ''),
@@ -433,10 +669,13 @@ class KenyaLawReportsScraper:
                         link,
                         datetime.now().isoformat()
                     ])
+                    if (len(self._meta_buf) >= METADATA_FLUSH_EVERY or
+                            time.monotonic() - self._meta_last_flush > METADATA_FLUSH_INTERVAL):
+                        self._flush_metadata()
                 
-                # Update progress
-                self.progress['scraped_judgments'].add(judgment_id)
-                self._save_progress()
+                # Update progress (the ID reaches PROGRESS_DB when its metadata row is flushed)
+                with self._progress_lock:
+                    self.progress['scraped_judgments'].add(judgment_id)
                 
                 logger.info(f"Successfully saved judgment: {filename}")
                 judgment_metadata['status'] = 'success'
@@ -458,8 +697,18 @@ class KenyaLawReportsScraper:
     
     def scrape(self):
         """Main scraping function to fetch all judgments."""
-        # Get the total number of pages
-        total_pages = self.get_total_pages()
+        # Get the total number of pages, reusing the count saved by a previous run until
+        # that many pages have been scraped, then checking again in case the site has grown
+        total_pages = self.progress.get('total_pages')
+        if not total_pages or self.progress['last_page'] >= total_pages:
+            fetched_pages = self.get_total_pages()
+            if fetched_pages:
+                # Only counts actually read from the site are saved
+                total_pages = self.progress['total_pages'] = fetched_pages
+            elif fetched_pages is None and not total_pages:
+                # Default fallback - use the known total divided by results per page
+                logger.warning(f"Using default total judgments count ({DEFAULT_TOTAL_JUDGMENTS:,})")
+                total_pages = (DEFAULT_TOTAL_JUDGMENTS + RESULTS_PER_PAGE - 1) // RESULTS_PER_PAGE
         if not total_pages:
             logger.error("Could not determine total pages. Exiting.")
             return
@@ -485,53 +734,100 @@ class KenyaLawReportsScraper:
             'skipped': 0
         }
         
-        # Process each page
-        for page in range(start_page, total_pages + 1):
+        # Judgments are submitted to the worker pool as each listing page arrives and
+        # collected as they complete, so workers never wait for a whole page to finish.
+        pending = {}  # Future -> page it came from
+        page_remaining = {}  # Page -> judgments not yet completed, in page order
+        
+        def collect(future):
+            """Record a completed judgment and advance last_page once whole pages are done."""
+            page = pending.pop(future)
             try:
-                logger.info(f"Processing page {page} of {total_pages}")
-                judgments = self.get_judgments_on_page(page)
-                
-                if not judgments:
-                    logger.warning(f"No judgments found on page {page}")
-                    continue
-                
-                # Update statistics for judgments found
-                stats['total_scraped'] += len(judgments)
-                
-                # Use ThreadPoolExecutor for parallel processing
-                with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-                    results = list(tqdm(
-                        executor.map(self.save_judgment, judgments),
-                        total=len(judgments),
-                        desc=f"Page {page}/{total_pages}"
-                    ))
-                
-                # Update statistics based on results
-                for result in results:
-                    if result.get('status') == 'success':
-                        stats['success'] += 1
-                    elif result.get('status') == 'failed':
-                        stats['failed'] += 1
-                    elif result.get('status') == 'no_content':
-                        stats['no_content'] += 1
-                    elif result.get('status') == 'error':
-                        stats['errors'] += 1
-                    else:
-                        stats['skipped'] += 1
+                status = future.result().get('status')
+            except Exception as e:
+                logger.error(f"Error processing judgment on page {page}: {str(e)}")
+                self._log_error(f"Error processing judgment on page {page}: {str(e)}")
+                status = 'error'
+            
+            if status == 'success':
+                stats['success'] += 1
+            elif status == 'failed':
+                stats['failed'] += 1
+            elif status == 'no_content':
+                stats['no_content'] += 1
+            elif status == 'error':
+                stats['errors'] += 1
+            else:
+                stats['skipped'] += 1
+            progress_bar.update(1)
+            
+            # A page counts as done once it and every page before it are complete
+            page_remaining[page] -= 1
+            done_page = None
+            for p in list(page_remaining):
+                if page_remaining[p]:
+                    break
+                del page_remaining[p]
+                done_page = p
+            
+            if done_page is not None:
+                # Write the buffered metadata rows (and record their IDs) before
+                # last_page moves past them, so resume never skips an unrecorded judgment
+                with self._meta_lock:
+                    self._flush_metadata()
                 
                 # Update and save progress
-                self.progress['last_page'] = page
+                self.progress['last_page'] = done_page
                 self._save_progress()
                 
                 # Log current statistics
                 logger.info(f"Statistics: {stats}")
+        
+        try:
+            # A separate single worker fetches the next listing page while the current one is processed.
+            # One progress bar covers the whole run; its total is an estimate from the page count.
+            with ThreadPoolExecutor(max_workers=1) as listing_executor, \
+                    tqdm(total=(total_pages - start_page + 1) * RESULTS_PER_PAGE,
+                         desc='Judgments', mininterval=1.0) as progress_bar:
+                next_listing = listing_executor.submit(self.get_judgments_on_page, start_page)
+                for page in range(start_page, total_pages + 1):
+                    try:
+                        logger.info(f"Processing page {page} of {total_pages}")
+                        listing = next_listing
+                        if page < total_pages:
+                            next_listing = listing_executor.submit(self.get_judgments_on_page, page + 1)
+                        judgments = listing.result()
+                        
+                        if not judgments:
+                            logger.warning(f"No judgments found on page {page}")
+                            continue
+                        
+                        # Update statistics for judgments found
+                        stats['total_scraped'] += len(judgments)
+                        
+                        page_remaining[page] = len(judgments)
+                        for judgment in judgments:
+                            pending[self._pool.submit(self.save_judgment, judgment)] = page
+                        
+                        # Keep at most about one page of judgments queued ahead of the workers
+                        if len(pending) > RESULTS_PER_PAGE:
+                            for future in as_completed(list(pending)):
+                                collect(future)
+                                if len(pending) <= RESULTS_PER_PAGE:
+                                    break
+                        
+                    except Exception as e:
+                        logger.error(f"Error processing page {page}: {str(e)}")
+                        self._log_error(f"Error processing page {page}: {str(e)}")
                 
-                # Add a delay between pages
-                time.sleep(random.uniform(MIN_DELAY, MAX_DELAY))
-                
-            except Exception as e:
-                logger.error(f"Error processing page {page}: {str(e)}")
-                self._log_error(f"Error processing page {page}: {str(e)}")
+                # Wait for the judgments still in flight
+                for future in as_completed(list(pending)):
+                    collect(future)
+        except KeyboardInterrupt:
+            # Drop queued judgments so only those already in flight finish before the
+            # atexit handlers save progress
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            raise
         
         # Log final statistics
         logger.info(f"Scraping completed. Final statistics: {stats}")
@@ -64,7 +64,7 @@ command -v pip3 >/dev/null 2>&1 || { echo "pip3 is required but not installed. A
 # Install required packages if needed
 if ! pip3 freeze | grep -q "beautifulsoup4"; then
     echo "Installing required Python packages..."
-    pip3 install requests beautifulsoup4 tqdm
+    pip3 install requests beautifulsoup4 lxml tqdm zstandard
 fi
 
 # Parse command line arguments